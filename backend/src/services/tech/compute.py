@@ -24,9 +24,8 @@ def compute_indicators_tail(df: pd.DataFrame) -> pd.DataFrame:
     adx = ta.adx(out["high"], out["low"], out["close"], length=14)
     out["adx14"]  = adx.get("ADX_14", adx.iloc[:, 0])
 
-    dc = ta.donchian(out["high"], out["low"], lower_length=20, upper_length=20)
-    out["donch20_high"] = dc.iloc[:, 0]
-    out["donch20_low"]  = dc.iloc[:, 1]
+    out["donch20_high"] = out["high"].rolling(20, min_periods=20).max()
+    out["donch20_low"]  = out["low"].rolling(20, min_periods=20).min()
 
     macd = ta.macd(out["close"])  # 12,26,9
     out["macd"]        = macd.get("MACD_12_26_9", macd.iloc[:, 0])
@@ -241,7 +241,7 @@ Index('eod_scan_errors_scan_id_idx', EodScanError.eod_scan_id)
 Index('tech_jobs_started_at_idx', TechJob.started_at)
 Index('tech_job_errors_job_id_idx', TechJobError.tech_job_id)
 Index('tech_job_skips_job_id_idx', TechJobSkip.tech_job_id)
-Index('tech_job_successes_job_id_idx', TechJobSuccess.tech_job_id)
+Index('tech_job_successes_job_created_idx', TechJobSuccess.tech_job_id, TechJobSuccess.created_at.desc())
 Index('daily_signals_jobs_started_at_idx', DailySignalsJob.started_at)
 Index('weekly_bars_jobs_started_at_idx', WeeklyBarsJob.started_at)
 Index('weekly_technicals_jobs_started_at_idx', WeeklyTechnicalsJob.started_at)
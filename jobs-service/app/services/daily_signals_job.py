@@ -4,7 +4,9 @@ Computes daily signal flags, trend scores, and proposed trade levels
 Integrated with jobs-service tracking and error handling
 """
 import asyncio
+import functools
 import logging
+import pathlib
 from datetime import datetime
 from typing import Dict, Any
 from sqlalchemy import create_engine, text
@@ -16,6 +18,24 @@ from app.services.job_status import begin_job, complete_job, fail_job, prune_his
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
+def _load_sql_script() -> str:
+    """Read the daily signals SQL script once per process"""
+    # SQL script is in /app parent directory (mystockproject/sql/)
+    sql_file = pathlib.Path(__file__).parent.parent.parent.parent / "sql" / "daily_signals_upsert.sql"
+
+    if not sql_file.exists():
+        raise FileNotFoundError(f"SQL script not found: {sql_file}")
+
+    return sql_file.read_text()
+
+
+@functools.lru_cache(maxsize=1)
+def _signals_statement():
+    """Build the text() clause for the daily signals script once per process"""
+    return text(_load_sql_script())
+
+
 class DailySignalsJob:
     """Daily signals computation job with tracking"""
 
@@ -25,23 +45,13 @@ class DailySignalsJob:
 
     def load_sql_script(self) -> str:
         """Load the daily signals SQL script"""
-        # SQL script is in /app parent directory (mystockproject/sql/)
-        import pathlib
-        sql_file = pathlib.Path(__file__).parent.parent.parent.parent / "sql" / "daily_signals_upsert.sql"
-
-        if not sql_file.exists():
-            raise FileNotFoundError(f"SQL script not found: {sql_file}")
-
-        with open(sql_file, 'r') as f:
-            return f.read()
+        return _load_sql_script()
 
     def execute_signals_computation(self) -> Dict[str, Any]:
         """Execute the daily signals SQL script"""
-        sql_script = self.load_sql_script()
-
         with self.Session() as session:
             # Execute the SQL script
-            session.execute(text(sql_script))
+            session.execute(_signals_statement())
             session.commit()
 
         logger.info("✅ Daily signals computation complete")
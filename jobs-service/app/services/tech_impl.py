@@ -83,13 +83,8 @@ def compute_indicators_tail(df: pd.DataFrame) -> pd.DataFrame:
 
     # Donchian channels
     if data_length >= 5:
-        dc = ta.donchian(out["high"], out["low"], lower_length=donch_period, upper_length=donch_period)
-        if dc is not None and not dc.empty and len(dc.columns) >= 2:
-            out["donch20_high"] = dc.iloc[:, 0]
-            out["donch20_low"]  = dc.iloc[:, 1]
-        else:
-            out["donch20_high"] = np.nan
-            out["donch20_low"]  = np.nan
+        out["donch20_high"] = out["high"].rolling(donch_period, min_periods=donch_period).max()
+        out["donch20_low"]  = out["low"].rolling(donch_period, min_periods=donch_period).min()
     else:
         out["donch20_high"] = np.nan
         out["donch20_low"]  = np.nan
@@ -4,7 +4,9 @@ Computes weekly signal flags and trend scores
 Integrated with jobs-service tracking and error handling
 """
 import asyncio
+import functools
 import logging
+import pathlib
 from datetime import datetime
 from typing import Dict, Any
 from sqlalchemy import create_engine, text
@@ -16,6 +18,24 @@ from app.services.job_status import begin_job, complete_job, fail_job, prune_his
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
+def _load_sql_script() -> str:
+    """Read the weekly signals SQL script once per process"""
+    # SQL script is in /app parent directory (mystockproject/sql/)
+    sql_file = pathlib.Path(__file__).parent.parent.parent.parent / "sql" / "weekly_signals_upsert.sql"
+
+    if not sql_file.exists():
+        raise FileNotFoundError(f"SQL script not found: {sql_file}")
+
+    return sql_file.read_text()
+
+
+@functools.lru_cache(maxsize=1)
+def _signals_statement():
+    """Build the text() clause for the weekly signals script once per process"""
+    return text(_load_sql_script())
+
+
 class WeeklySignalsJob:
     """Weekly signals computation job with tracking"""
 
@@ -25,23 +45,13 @@ class WeeklySignalsJob:
 
     def load_sql_script(self) -> str:
         """Load the weekly signals SQL script"""
-        # SQL script is in /app parent directory (mystockproject/sql/)
-        import pathlib
-        sql_file = pathlib.Path(__file__).parent.parent.parent.parent / "sql" / "weekly_signals_upsert.sql"
-
-        if not sql_file.exists():
-            raise FileNotFoundError(f"SQL script not found: {sql_file}")
-
-        with open(sql_file, 'r') as f:
-            return f.read()
+        return _load_sql_script()
 
     def execute_signals_computation(self) -> Dict[str, Any]:
         """Execute the weekly signals SQL script"""
-        sql_script = self.load_sql_script()
-
         with self.Session() as session:
             # Execute the SQL script
-            session.execute(text(sql_script))
+            session.execute(_signals_statement())
             session.commit()
 
         logger.info("✅ Weekly signals computation complete")
@@ -49,19 +59,28 @@ class WeeklySignalsJob:
 
     def get_statistics(self) -> Dict[str, Any]:
         """Get statistics after signal computation"""
+        # Each count is a separate scalar subquery whose predicate matches one of the
+        # partial indexes in migrations/003_indexes.sql, so the planner can answer it
+        # with an index-only scan instead of one FILTER pass over the whole table.
         stats_query = text("""
+            WITH counts AS (
+                SELECT
+                    (SELECT COUNT(*) FROM weekly_signals_latest) AS total_symbols,
+                    (SELECT COUNT(*) FROM weekly_signals_latest
+                     WHERE trend_score_w >= 40) AS strong_trend_count,
+                    (SELECT COUNT(*) FROM weekly_signals_latest
+                     WHERE stack_10_30_40 = TRUE) AS stack_count,
+                    (SELECT COUNT(*) FROM weekly_signals_latest
+                     WHERE close_above_30w = TRUE) AS above_30w_count,
+                    (SELECT COUNT(*) FROM weekly_signals_latest
+                     WHERE macd_w_cross_up = TRUE) AS macd_cross_count,
+                    (SELECT COUNT(*) FROM weekly_signals_latest
+                     WHERE donch20w_breakout = TRUE) AS breakout_count
+            )
             SELECT
-                COUNT(*) AS total_symbols,
-                COUNT(*) FILTER (WHERE trend_score_w >= 40) AS strong_trend_count,
-                COUNT(*) FILTER (WHERE stack_10_30_40 = TRUE) AS stack_count,
-                COUNT(*) FILTER (WHERE close_above_30w = TRUE) AS above_30w_count,
-                COUNT(*) FILTER (WHERE macd_w_cross_up = TRUE) AS macd_cross_count,
-                COUNT(*) FILTER (WHERE donch20w_breakout = TRUE) AS breakout_count,
-                ROUND(
-                    100.0 * COUNT(*) FILTER (WHERE trend_score_w >= 40) / NULLIF(COUNT(*), 0),
-                    2
-                ) AS pct_strong_trend
-            FROM weekly_signals_latest
+                *,
+                ROUND(100.0 * strong_trend_count / NULLIF(total_symbols, 0), 2) AS pct_strong_trend
+            FROM counts
         """)
 
         with self.Session() as session:
@@ -18,28 +18,102 @@ from app.services.job_status import begin_job, complete_job, fail_job, prune_his
 
 logger = logging.getLogger(__name__)
 
+# Statements are built once at import and reused for every row / run
+_SYMBOLS_SQL = text("""
+    SELECT DISTINCT symbol
+    FROM weekly_bars
+    WHERE week_end >= CURRENT_DATE - INTERVAL '150 weeks'
+    ORDER BY symbol
+""")
+
+_WEEKLY_BARS_SQL = text("""
+    SELECT symbol, week_end, open, high, low, close, volume
+    FROM weekly_bars
+    WHERE symbol = ANY(:symbols)
+      AND week_end >= CURRENT_DATE - INTERVAL '150 weeks'
+    ORDER BY symbol, week_end
+""")
+
+_EXISTING_KEYS_SQL = text("""
+    SELECT symbol, week_end FROM technical_weekly
+    WHERE symbol = ANY(:symbols)
+""")
+
+_UPSERT_SQL = text("""
+    INSERT INTO technical_weekly
+    (symbol, week_end, close, volume, sma10w, sma30w, sma40w, rsi14w, adx14w, atr14w,
+     donch20w_high, donch20w_low, macd_w, macd_signal_w, macd_hist_w,
+     avg_vol10w, high_52w, distance_to_52w_high_w, sma_w_slope)
+    VALUES (:symbol, :week_end, :close, :volume, :sma10w, :sma30w, :sma40w, :rsi14w, :adx14w, :atr14w,
+            :donch20w_high, :donch20w_low, :macd_w, :macd_signal_w, :macd_hist_w,
+            :avg_vol10w, :high_52w, :distance_to_52w_high_w, :sma_w_slope)
+    ON CONFLICT (symbol, week_end)
+    DO UPDATE SET
+        close = EXCLUDED.close,
+        volume = EXCLUDED.volume,
+        sma10w = EXCLUDED.sma10w,
+        sma30w = EXCLUDED.sma30w,
+        sma40w = EXCLUDED.sma40w,
+        rsi14w = EXCLUDED.rsi14w,
+        adx14w = EXCLUDED.adx14w,
+        atr14w = EXCLUDED.atr14w,
+        donch20w_high = EXCLUDED.donch20w_high,
+        donch20w_low = EXCLUDED.donch20w_low,
+        macd_w = EXCLUDED.macd_w,
+        macd_signal_w = EXCLUDED.macd_signal_w,
+        macd_hist_w = EXCLUDED.macd_hist_w,
+        avg_vol10w = EXCLUDED.avg_vol10w,
+        high_52w = EXCLUDED.high_52w,
+        distance_to_52w_high_w = EXCLUDED.distance_to_52w_high_w,
+        sma_w_slope = EXCLUDED.sma_w_slope,
+        updated_at = NOW()
+""")
+
+_REFRESH_SQL = text("REFRESH MATERIALIZED VIEW CONCURRENTLY technical_weekly_latest")
+
+# Weekly bars are loaded from the database this many symbols at a time
+_LOAD_BATCH_SYMBOLS = 100
+
+# Computed frames are flushed to the database every this many symbols
+_UPSERT_BATCH_SYMBOLS = 200
+
+# Rows per executemany call; psycopg2 pages each call via execute_batch
+_UPSERT_CHUNK_ROWS = 1000
+
+_INDICATOR_COLUMNS = [
+    'close', 'sma10w', 'sma30w', 'sma40w', 'rsi14w', 'adx14w', 'atr14w',
+    'donch20w_high', 'donch20w_low', 'macd_w', 'macd_signal_w', 'macd_hist_w',
+    'avg_vol10w', 'high_52w', 'distance_to_52w_high_w', 'sma_w_slope',
+]
+
 
 class WeeklyTechnicalsJob:
     """Weekly technicals computation job with tracking"""
 
     def __init__(self, db_dsn: str):
-        self.engine = create_engine(db_dsn, pool_pre_ping=True)
+        # values_plus_batch routes executemany through psycopg2's execute_batch,
+        # so one upsert call ships a page of rows per round trip
+        self.engine = create_engine(
+            db_dsn,
+            pool_pre_ping=True,
+            executemany_mode='values_plus_batch',
+            executemany_batch_page_size=500,
+            insertmanyvalues_page_size=1000,
+        )
         self.Session = sessionmaker(bind=self.engine)
         self.job_id = None
 
-    def get_weekly_bars(self) -> pd.DataFrame:
-        """Load weekly bars from database"""
-        query = text("""
-            SELECT symbol, week_end, open, high, low, close, volume
-            FROM weekly_bars
-            WHERE week_end >= CURRENT_DATE - INTERVAL '150 weeks'
-            ORDER BY symbol, week_end
-        """)
+    def get_symbols(self) -> List[str]:
+        """Get symbols that have weekly bars in the lookback window"""
+        with self.Session() as session:
+            return session.execute(_SYMBOLS_SQL).scalars().all()
 
+    def get_weekly_bars(self, symbols: List[str]) -> pd.DataFrame:
+        """Load weekly bars for a batch of symbols from database"""
         with self.Session() as session:
-            df = pd.read_sql(query, session.connection())
+            df = pd.read_sql(_WEEKLY_BARS_SQL, session.connection(), params={'symbols': symbols})
 
-        logger.info(f"Loaded {len(df)} weekly bars")
+        logger.info(f"Loaded {len(df)} weekly bars for {len(symbols)} symbols")
         return df
 
     def compute_sma_slope(self, sma_series: pd.Series, window: int = 4) -> float:
@@ -57,196 +131,173 @@ class WeeklyTechnicalsJob:
         return float(slope)
 
     def compute_technicals_for_symbol(self, symbol_df: pd.DataFrame) -> pd.DataFrame:
-        """Compute all weekly indicators for one symbol"""
+        """Compute all weekly indicators for one symbol
+
+        Indicators are collected as column arrays and the result frame is built
+        once at the end, instead of inserting one DataFrame column at a time.
+        """
         if len(symbol_df) < 50:
             return pd.DataFrame()
 
-        df = symbol_df.copy()
-        df = df.sort_values('week_end')
+        df = symbol_df.sort_values('week_end')
+        close = df['close']
+        high = df['high']
+        low = df['low']
+        volume = df['volume']
+
+        out = {col: df[col].to_numpy() for col in df.columns}
 
         # SMAs
-        df['sma10w'] = ta.sma(df['close'], length=10)
-        df['sma30w'] = ta.sma(df['close'], length=30)
-        df['sma40w'] = ta.sma(df['close'], length=40)
+        sma30w = ta.sma(close, length=30)
+        out['sma10w'] = ta.sma(close, length=10).to_numpy()
+        out['sma30w'] = sma30w.to_numpy()
+        out['sma40w'] = ta.sma(close, length=40).to_numpy()
 
         # RSI
-        df['rsi14w'] = ta.rsi(df['close'], length=14)
+        out['rsi14w'] = ta.rsi(close, length=14).to_numpy()
 
         # ADX
-        adx_df = ta.adx(df['high'], df['low'], df['close'], length=14)
+        adx_df = ta.adx(high, low, close, length=14)
         if adx_df is not None and not adx_df.empty:
-            df['adx14w'] = adx_df['ADX_14']
+            out['adx14w'] = adx_df['ADX_14'].to_numpy()
 
         # ATR
-        df['atr14w'] = ta.atr(df['high'], df['low'], df['close'], length=14)
+        out['atr14w'] = ta.atr(high, low, close, length=14).to_numpy()
 
         # Donchian Channels
-        donchian = ta.donchian(df['high'], df['low'], length=20)
-        if donchian is not None and not donchian.empty:
-            df['donch20w_high'] = donchian[f'DCU_20_20']
-            df['donch20w_low'] = donchian[f'DCL_20_20']
+        out['donch20w_high'] = high.rolling(window=20).max().to_numpy()
+        out['donch20w_low'] = low.rolling(window=20).min().to_numpy()
 
         # MACD
-        macd_df = ta.macd(df['close'], fast=12, slow=26, signal=9)
+        macd_df = ta.macd(close, fast=12, slow=26, signal=9)
         if macd_df is not None and not macd_df.empty:
-            df['macd_w'] = macd_df['MACD_12_26_9']
-            df['macd_signal_w'] = macd_df['MACDs_12_26_9']
-            df['macd_hist_w'] = macd_df['MACDh_12_26_9']
+            out['macd_w'] = macd_df['MACD_12_26_9'].to_numpy()
+            out['macd_signal_w'] = macd_df['MACDs_12_26_9'].to_numpy()
+            out['macd_hist_w'] = macd_df['MACDh_12_26_9'].to_numpy()
 
         # Average volume
-        df['avg_vol10w'] = df['volume'].rolling(window=10).mean()
+        out['avg_vol10w'] = volume.rolling(window=10).mean().to_numpy()
 
         # 52-week high
-        df['high_52w'] = df['high'].rolling(window=52).max()
-        df['distance_to_52w_high_w'] = (df['close'] - df['high_52w']) / df['high_52w']
+        high_52w = high.rolling(window=52).max().to_numpy()
+        out['high_52w'] = high_52w
+        out['distance_to_52w_high_w'] = (out['close'] - high_52w) / high_52w
 
         # SMA slope
-        df['sma_w_slope'] = df['sma30w'].rolling(window=10).apply(
+        out['sma_w_slope'] = sma30w.rolling(window=10).apply(
             lambda x: self.compute_sma_slope(x, window=4) if len(x) >= 4 else None,
             raw=False
-        )
+        ).to_numpy()
 
-        return df
+        return pd.DataFrame(out)
+
+    def _records(self, rows: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Bind parameters for technicals rows (NaN becomes NULL), built column-wise"""
+        frame = rows.reindex(columns=['symbol', 'week_end', 'volume'] + _INDICATOR_COLUMNS)
+        frame[_INDICATOR_COLUMNS] = frame[_INDICATOR_COLUMNS].astype(float)
+        frame['volume'] = frame['volume'].fillna(0).astype('int64')
+        frame = frame.astype(object).where(frame.notna(), None)
+        return frame.to_dict(orient='records')
 
     def upsert_technicals(self, tech_df: pd.DataFrame) -> Dict[str, int]:
-        """Upsert technicals with ON CONFLICT DO UPDATE"""
+        """Upsert technicals with ON CONFLICT DO UPDATE in batched executemany calls"""
         if tech_df.empty:
             return {'inserted': 0, 'updated': 0, 'skipped': 0}
 
+        # Skip rows with mostly null values
+        skip_mask = tech_df['sma10w'].isna() & tech_df['rsi14w'].isna()
+        skipped = int(skip_mask.sum())
+        rows = tech_df[~skip_mask]
+
+        records = self._records(rows)
         inserted = 0
         updated = 0
-        skipped = 0
 
         with self.Session() as session:
-            for _, row in tech_df.iterrows():
-                # Skip rows with mostly null values
-                if pd.isna(row.get('sma10w')) and pd.isna(row.get('rsi14w')):
-                    skipped += 1
-                    continue
-
-                # Check if exists
-                exists = session.execute(
-                    text("""
-                        SELECT id FROM technical_weekly
-                        WHERE symbol = :symbol AND week_end = :week_end
-                    """),
-                    {
-                        'symbol': row['symbol'],
-                        'week_end': row['week_end']
-                    }
-                ).fetchone()
-
-                params = {
-                    'symbol': row['symbol'],
-                    'week_end': row['week_end'],
-                    'close': float(row['close']) if pd.notna(row.get('close')) else None,
-                    'volume': int(row['volume']) if pd.notna(row.get('volume')) else 0,
-                    'sma10w': float(row['sma10w']) if pd.notna(row.get('sma10w')) else None,
-                    'sma30w': float(row['sma30w']) if pd.notna(row.get('sma30w')) else None,
-                    'sma40w': float(row['sma40w']) if pd.notna(row.get('sma40w')) else None,
-                    'rsi14w': float(row['rsi14w']) if pd.notna(row.get('rsi14w')) else None,
-                    'adx14w': float(row['adx14w']) if pd.notna(row.get('adx14w')) else None,
-                    'atr14w': float(row['atr14w']) if pd.notna(row.get('atr14w')) else None,
-                    'donch20w_high': float(row['donch20w_high']) if pd.notna(row.get('donch20w_high')) else None,
-                    'donch20w_low': float(row['donch20w_low']) if pd.notna(row.get('donch20w_low')) else None,
-                    'macd_w': float(row['macd_w']) if pd.notna(row.get('macd_w')) else None,
-                    'macd_signal_w': float(row['macd_signal_w']) if pd.notna(row.get('macd_signal_w')) else None,
-                    'macd_hist_w': float(row['macd_hist_w']) if pd.notna(row.get('macd_hist_w')) else None,
-                    'avg_vol10w': float(row['avg_vol10w']) if pd.notna(row.get('avg_vol10w')) else None,
-                    'high_52w': float(row['high_52w']) if pd.notna(row.get('high_52w')) else None,
-                    'distance_to_52w_high_w': float(row['distance_to_52w_high_w']) if pd.notna(row.get('distance_to_52w_high_w')) else None,
-                    'sma_w_slope': float(row['sma_w_slope']) if pd.notna(row.get('sma_w_slope')) else None,
-                }
-
-                if exists:
-                    session.execute(
-                        text("""
-                            UPDATE technical_weekly
-                            SET close = :close, volume = :volume,
-                                sma10w = :sma10w, sma30w = :sma30w, sma40w = :sma40w,
-                                rsi14w = :rsi14w, adx14w = :adx14w, atr14w = :atr14w,
-                                donch20w_high = :donch20w_high, donch20w_low = :donch20w_low,
-                                macd_w = :macd_w, macd_signal_w = :macd_signal_w, macd_hist_w = :macd_hist_w,
-                                avg_vol10w = :avg_vol10w, high_52w = :high_52w,
-                                distance_to_52w_high_w = :distance_to_52w_high_w, sma_w_slope = :sma_w_slope
-                            WHERE symbol = :symbol AND week_end = :week_end
-                        """),
-                        params
-                    )
-                    updated += 1
-                else:
-                    session.execute(
-                        text("""
-                            INSERT INTO technical_weekly
-                            (symbol, week_end, close, volume, sma10w, sma30w, sma40w, rsi14w, adx14w, atr14w,
-                             donch20w_high, donch20w_low, macd_w, macd_signal_w, macd_hist_w,
-                             avg_vol10w, high_52w, distance_to_52w_high_w, sma_w_slope)
-                            VALUES (:symbol, :week_end, :close, :volume, :sma10w, :sma30w, :sma40w, :rsi14w, :adx14w, :atr14w,
-                                    :donch20w_high, :donch20w_low, :macd_w, :macd_signal_w, :macd_hist_w,
-                                    :avg_vol10w, :high_52w, :distance_to_52w_high_w, :sma_w_slope)
-                        """),
-                        params
-                    )
-                    inserted += 1
-
-                # Update progress
-                if (inserted + updated) % 50 == 0 and self.job_id:
-                    update_job_progress(self.job_id, inserted + updated)
+            # One key lookup for the batch keeps the inserted/updated split
+            existing = set(
+                session.execute(
+                    _EXISTING_KEYS_SQL,
+                    {'symbols': list(rows['symbol'].unique())}
+                ).tuples()
+            )
+
+            for start in range(0, len(records), _UPSERT_CHUNK_ROWS):
+                chunk = records[start:start + _UPSERT_CHUNK_ROWS]
+                session.execute(_UPSERT_SQL, chunk)
+
+                chunk_updated = sum(
+                    1 for r in chunk if (r['symbol'], r['week_end']) in existing
+                )
+                updated += chunk_updated
+                inserted += len(chunk) - chunk_updated
 
             session.commit()
 
         logger.info(f"Upserted technicals: {inserted} inserted, {updated} updated, {skipped} skipped")
         return {'inserted': inserted, 'updated': updated, 'skipped': skipped}
 
+    def _flush_technicals(self, pending: List[pd.DataFrame], stats: Dict[str, int]):
+        """Upsert a batch of per-symbol frames, accumulate counts and clear the batch"""
+        batch_stats = self.upsert_technicals(pd.concat(pending, ignore_index=True))
+        for key in stats:
+            stats[key] += batch_stats[key]
+        pending.clear()
+
     def refresh_materialized_view(self):
         """Refresh technical_weekly_latest materialized view"""
         with self.Session() as session:
-            session.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY technical_weekly_latest"))
+            session.execute(_REFRESH_SQL)
             session.commit()
         logger.info("Refreshed technical_weekly_latest materialized view")
 
     async def run(self) -> Dict[str, Any]:
         """Execute weekly technicals job"""
         try:
-            # Load weekly bars
-            weekly_df = self.get_weekly_bars()
-            if weekly_df.empty:
+            symbols = self.get_symbols()
+            if not symbols:
                 logger.warning("No weekly bars found")
                 return {'success': True, 'symbols_processed': 0}
 
-            symbols = weekly_df['symbol'].unique()
             logger.info(f"Processing {len(symbols)} symbols")
 
-            all_technicals = []
+            pending = []
+            stats = {'inserted': 0, 'updated': 0, 'skipped': 0}
             processed = 0
             errors = 0
 
-            for symbol in symbols:
-                try:
-                    symbol_df = weekly_df[weekly_df['symbol'] == symbol]
-                    tech_df = self.compute_technicals_for_symbol(symbol_df)
+            # Only one batch of weekly bars is resident at a time
+            for batch_start in range(0, len(symbols), _LOAD_BATCH_SYMBOLS):
+                batch = symbols[batch_start:batch_start + _LOAD_BATCH_SYMBOLS]
+                weekly_df = self.get_weekly_bars(batch)
+
+                for symbol, symbol_df in weekly_df.groupby('symbol', sort=False):
+                    try:
+                        tech_df = self.compute_technicals_for_symbol(symbol_df)
+
+                        if not tech_df.empty:
+                            pending.append(tech_df)
+
+                        processed += 1
 
-                    if not tech_df.empty:
-                        all_technicals.append(tech_df)
+                        # Update progress every 100 symbols
+                        if processed % 100 == 0:
+                            logger.info(f"Processed {processed}/{len(symbols)} symbols")
+                            if self.job_id:
+                                update_job_progress(self.job_id, processed)
 
-                    processed += 1
+                    except Exception as e:
+                        logger.error(f"Error processing {symbol}: {str(e)}")
+                        errors += 1
 
-                    # Update progress every 100 symbols
-                    if processed % 100 == 0:
-                        logger.info(f"Processed {processed}/{len(symbols)} symbols")
-                        if self.job_id:
-                            update_job_progress(self.job_id, processed)
+                    # Flush in bounded batches so the full result set is never concatenated
+                    if len(pending) >= _UPSERT_BATCH_SYMBOLS:
+                        self._flush_technicals(pending, stats)
 
-                except Exception as e:
-                    logger.error(f"Error processing {symbol}: {str(e)}")
-                    errors += 1
+                del weekly_df
 
-            # Combine all results
-            if all_technicals:
-                combined_df = pd.concat(all_technicals, ignore_index=True)
-                stats = self.upsert_technicals(combined_df)
-            else:
-                stats = {'inserted': 0, 'updated': 0, 'skipped': 0}
+            if pending:
+                self._flush_technicals(pending, stats)
 
             # Refresh materialized view
             self.refresh_materialized_view()
@@ -6,56 +6,54 @@ from datetime import datetime, timezone
 from sqlalchemy import create_engine, text
 from app.core.config import DATABASE_URL
 
+# Both tables are updated by one statement so they share a round trip and a commit
+CLEANUP_SQL = text("""
+    WITH eod AS (
+        UPDATE eod_scans
+        SET status = 'failed', completed_at = :now
+        WHERE status = 'running' AND completed_at IS NULL
+        RETURNING id, scan_date::text AS label, started_at
+    ),
+    jobs AS (
+        UPDATE job_execution_status
+        SET status = 'failed'
+        WHERE status = 'running' AND completed_at IS NULL
+        RETURNING id, job_name AS label, started_at
+    )
+    SELECT 'eod' AS src, id, label, started_at FROM eod
+    UNION ALL
+    SELECT 'job' AS src, id, label, started_at FROM jobs
+""")
+
 def cleanup_stuck_jobs():
     """Mark stuck jobs as failed"""
     engine = create_engine(DATABASE_URL)
 
     with engine.connect() as conn:
-        # Mark stuck EOD scans as failed
         try:
-            print("Checking for stuck EOD scans...")
-            result = conn.execute(text("""
-                UPDATE eod_scans
-                SET status = 'failed', completed_at = :now
-                WHERE status = 'running' AND completed_at IS NULL
-                RETURNING id, scan_date, started_at
-            """), {"now": datetime.now(timezone.utc)})
-
-            updated_scans = result.fetchall()
+            print("Checking for stuck EOD scans and job execution statuses...")
+            rows = conn.execute(CLEANUP_SQL, {"now": datetime.now(timezone.utc)}).fetchall()
             conn.commit()
-
-            if updated_scans:
-                print(f"✅ Marked {len(updated_scans)} stuck EOD scans as failed:")
-                for scan_id, scan_date, started_at in updated_scans:
-                    print(f"  - Scan #{scan_id} (date: {scan_date}, started: {started_at})")
-            else:
-                print("✅ No stuck EOD scans found")
-
-        except Exception as e:
-            print(f"❌ Error cleaning up EOD scans: {e}")
-
-        # Mark stuck job execution statuses as failed
-        try:
-            print("Checking for stuck job execution statuses...")
-            result = conn.execute(text("""
-                UPDATE job_execution_status
-                SET status = 'failed'
-                WHERE status = 'running' AND completed_at IS NULL
-                RETURNING id, job_name, started_at
-            """))
-
-            updated_jobs = result.fetchall()
-            conn.commit()
-
-            if updated_jobs:
-                print(f"✅ Marked {len(updated_jobs)} stuck job execution statuses as failed:")
-                for job_id, job_name, started_at in updated_jobs:
-                    print(f"  - Job #{job_id} ({job_name}, started: {started_at})")
-            else:
-                print("✅ No stuck job execution statuses found")
-
         except Exception as e:
-            print(f"❌ Error cleaning up job execution statuses: {e}")
+            print(f"❌ Error cleaning up stuck jobs: {e}")
+            return
+
+    updated_scans = [row for row in rows if row.src == 'eod']
+    updated_jobs = [row for row in rows if row.src == 'job']
+
+    if updated_scans:
+        print(f"✅ Marked {len(updated_scans)} stuck EOD scans as failed:")
+        for _, scan_id, scan_date, started_at in updated_scans:
+            print(f"  - Scan #{scan_id} (date: {scan_date}, started: {started_at})")
+    else:
+        print("✅ No stuck EOD scans found")
+
+    if updated_jobs:
+        print(f"✅ Marked {len(updated_jobs)} stuck job execution statuses as failed:")
+        for _, job_id, job_name, started_at in updated_jobs:
+            print(f"  - Job #{job_id} ({job_name}, started: {started_at})")
+    else:
+        print("✅ No stuck job execution statuses found")
 
 if __name__ == "__main__":
-    cleanup_stuck_jobs()
\ No newline at end of file
+    cleanup_stuck_jobs()
@@ -25,7 +25,7 @@ sys.path.insert(0, '/app')
 
 try:
     from app.config.job_table_mappings import JOB_TABLE_MAPPINGS, get_all_tables
-    from app.core.database import get_db
+    from app.core.database import engine
     from sqlalchemy import text, inspect
 except ImportError as e:
     print(f"❌ Import error: {e}")
@@ -36,42 +36,31 @@ except ImportError as e:
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
-def check_database_connection():
-    """Check if we can connect to the database"""
+def check_database_connection(conn):
+    """Check if we can run a query on the open connection"""
     try:
-        db = next(get_db())
-        db.execute(text("SELECT 1"))
-        db.close()
+        conn.execute(text("SELECT 1"))
         return True
     except Exception as e:
         logger.error(f"Database connection failed: {e}")
         return False
 
-def get_existing_tables():
+def get_existing_tables(conn):
     """Get list of all existing tables in the database"""
     try:
-        db = next(get_db())
-        inspector = inspect(db.bind)
-        tables = inspector.get_table_names()
-        db.close()
-        return set(tables)
+        inspector = inspect(conn)
+        return set(inspector.get_table_names())
     except Exception as e:
         logger.error(f"Failed to get table list: {e}")
         return set()
 
-def validate_table_mappings() -> tuple[bool, List[str]]:
+def validate_table_mappings(mapped_tables: set, existing_tables: set) -> tuple[bool, List[str]]:
     """
     Validate that all tables in job mappings exist in database.
     Returns (is_valid, list_of_errors)
     """
     errors = []
 
-    # Get all tables from mappings
-    mapped_tables = set(get_all_tables())
-
-    # Get existing tables from database
-    existing_tables = get_existing_tables()
-
     if not existing_tables:
         errors.append("Could not retrieve table list from database")
         return False, errors
@@ -133,25 +122,32 @@ def main():
     """Main validation function"""
     print("🔍 Validating job table mappings...")
 
-    # Check database connection
-    if not check_database_connection():
+    # One connection serves both the health check and the table listing
+    try:
+        with engine.connect() as conn:
+            if not check_database_connection(conn):
+                print("❌ Cannot connect to database")
+                sys.exit(2)
+            existing_tables = get_existing_tables(conn)
+    except Exception as e:
+        logger.error(f"Database connection failed: {e}")
         print("❌ Cannot connect to database")
         sys.exit(2)
 
     # Validate mappings
-    is_valid, errors = validate_table_mappings()
+    mapped_tables = set(get_all_tables())
+    is_valid, errors = validate_table_mappings(mapped_tables, existing_tables)
 
     if is_valid:
         print("✅ All job table mappings are valid!")
-        print(f"✅ Verified {len(get_all_tables())} tables exist in database")
-        print_summary()
-        sys.exit(0)
+        print(f"✅ Verified {len(mapped_tables)} tables exist in database")
     else:
         print("❌ Job table mapping validation failed!")
         for error in errors:
             print(f"   • {error}")
-        print_summary()
-        sys.exit(1)
+
+    print_summary()
+    sys.exit(0 if is_valid else 1)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -9,13 +9,20 @@ Runs after daily technical indicators are computed.
 Schedule: Daily at 17:40 CT (after Schwab EOD import and technical compute)
 
 Usage:
-    python jobs/daily_signals_job.py [--dry-run]
+    python jobs/daily_signals_job.py [--dry-run] [--full-refresh]
 
 Environment:
     DB_DSN: PostgreSQL connection string
     DAILY_JOB_TIME_CT: 17:40 (default)
+
+Indexes (migrations/004_signals_report_indexes.sql):
+    idx_signals_top_breakouts: serves the top-breakouts section of the report
+        as an index range scan (trend_score_d >= 30, in report order)
+    idx_signals_active_setups: serves the trade-setups section
+        (proposed_entry IS NOT NULL, in report order)
 """
 
+import functools
 import os
 import sys
 import logging
@@ -34,6 +41,91 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=None)
+def _load_sql_script(filename: str) -> str:
+    """Read a SQL script from the sql/ directory once per process"""
+    sql_file = Path(__file__).parent.parent / "sql" / filename
+
+    if not sql_file.exists():
+        raise FileNotFoundError(f"SQL script not found: {sql_file}")
+
+    return sql_file.read_text()
+
+
+# Statistics, top breakouts and trade setups from signals_daily_latest as one
+# row of JSON columns; list sections default to [] when nothing matches
+REPORT_SQL = """
+    WITH stats AS (
+        SELECT
+            COUNT(*) AS total_symbols,
+            COUNT(*) FILTER (WHERE trend_score_d >= 40) AS strong_trend_count,
+            COUNT(*) FILTER (WHERE donch20_breakout = TRUE) AS breakout_count,
+            COUNT(*) FILTER (WHERE macd_cross_up = TRUE) AS macd_cross_count,
+            COUNT(*) FILTER (WHERE sma20_cross_50_up = TRUE) AS sma_cross_count,
+            COUNT(*) FILTER (WHERE proposed_entry IS NOT NULL) AS trade_setups_count,
+            ROUND(
+                100.0 * COUNT(*) FILTER (WHERE trend_score_d >= 40) / NULLIF(COUNT(*), 0),
+                2
+            ) AS pct_strong_trend
+        FROM signals_daily_latest
+    ),
+    top_breakouts AS (
+        SELECT
+            symbol,
+            date,
+            trend_score_d,
+            sma20_cross_50_up,
+            price_above_200,
+            macd_cross_up,
+            donch20_breakout,
+            high_tight_zone,
+            proposed_entry,
+            proposed_stop,
+            target1,
+            target2,
+            risk_reward_ratio,
+            notes
+        FROM signals_daily_latest
+        WHERE trend_score_d >= 30  -- Minimum threshold for display
+        ORDER BY trend_score_d DESC, donch20_breakout DESC, symbol
+        LIMIT :limit
+    ),
+    trade_setups AS (
+        SELECT
+            symbol,
+            date,
+            trend_score_d,
+            donch20_breakout,
+            proposed_entry,
+            proposed_stop,
+            target1,
+            target2,
+            risk_reward_ratio,
+            notes
+        FROM signals_daily_latest
+        WHERE proposed_entry IS NOT NULL
+        ORDER BY trend_score_d DESC, risk_reward_ratio DESC NULLS LAST
+        LIMIT :limit
+    )
+    SELECT
+        (SELECT row_to_json(s) FROM stats s) AS stats,
+        (
+            SELECT COALESCE(
+                json_agg(b ORDER BY b.trend_score_d DESC, b.donch20_breakout DESC, b.symbol),
+                '[]'::json
+            )
+            FROM top_breakouts b
+        ) AS top_breakouts,
+        (
+            SELECT COALESCE(
+                json_agg(t ORDER BY t.trend_score_d DESC, t.risk_reward_ratio DESC NULLS LAST),
+                '[]'::json
+            )
+            FROM trade_setups t
+        ) AS trade_setups
+"""
+
+
 class DailySignalsJob:
     """Computes daily signals and proposed trade setups"""
 
@@ -41,18 +133,18 @@ class DailySignalsJob:
         self.engine = create_engine(db_dsn, pool_pre_ping=True)
         self.Session = sessionmaker(bind=self.engine)
 
-    def load_sql_script(self) -> str:
-        """Load the daily signals SQL script"""
-        sql_file = Path(__file__).parent.parent / "sql" / "daily_signals_upsert.sql"
-
-        if not sql_file.exists():
-            raise FileNotFoundError(f"SQL script not found: {sql_file}")
+    def load_sql_script(self, filename: str = "daily_signals_upsert.sql") -> str:
+        """Load a daily signals SQL script from the sql/ directory"""
+        return _load_sql_script(filename)
 
-        with open(sql_file, 'r') as f:
-            return f.read()
+    def execute_signals_computation(self, dry_run: bool = False, full_refresh: bool = False) -> Dict[str, Any]:
+        """
+        Execute the daily signals SQL script.
 
-    def execute_signals_computation(self, dry_run: bool = False) -> Dict[str, Any]:
-        """Execute the daily signals SQL script"""
+        The script only refreshes signals_daily_latest for symbols that got a
+        signal on the latest date; full_refresh additionally rebuilds it from
+        the whole signals_daily_hist history.
+        """
         if dry_run:
             logger.info("[DRY RUN] Would execute daily signals computation")
             return {
@@ -68,131 +160,85 @@ class DailySignalsJob:
             session.execute(text(sql_script))
             session.commit()
 
+            if full_refresh:
+                session.execute(text(self.load_sql_script("daily_signals_latest_rebuild.sql")))
+                session.commit()
+                logger.info("✅ Rebuilt signals_daily_latest from full history")
+
         logger.info("✅ Daily signals computation complete")
 
         return {"success": True, "dry_run": False}
 
-    def get_statistics(self) -> Dict[str, Any]:
-        """Get statistics after signal computation"""
-        stats_query = text("""
-            SELECT
-                COUNT(*) AS total_symbols,
-                COUNT(*) FILTER (WHERE trend_score_d >= 40) AS strong_trend_count,
-                COUNT(*) FILTER (WHERE donch20_breakout = TRUE) AS breakout_count,
-                COUNT(*) FILTER (WHERE macd_cross_up = TRUE) AS macd_cross_count,
-                COUNT(*) FILTER (WHERE sma20_cross_50_up = TRUE) AS sma_cross_count,
-                COUNT(*) FILTER (WHERE proposed_entry IS NOT NULL) AS trade_setups_count,
-                ROUND(
-                    100.0 * COUNT(*) FILTER (WHERE trend_score_d >= 40) / NULLIF(COUNT(*), 0),
-                    2
-                ) AS pct_strong_trend
-            FROM signals_daily_latest
-        """)
-
+    def get_report(self, limit: int = 10) -> Dict[str, Any]:
+        """
+        Get statistics, top breakouts and active trade setups in one round trip.
+        Each section is built as JSON by PostgreSQL and decoded by the driver.
+        """
         with self.Session() as session:
-            result = session.execute(stats_query).fetchone()
+            row = session.execute(text(REPORT_SQL), {"limit": limit}).one()
+
+        stats = row.stats
+        return {
+            "stats": {
+                "total_symbols": stats["total_symbols"],
+                "strong_trend_count": stats["strong_trend_count"],
+                "breakout_count": stats["breakout_count"],
+                "macd_cross_count": stats["macd_cross_count"],
+                "sma_cross_count": stats["sma_cross_count"],
+                "trade_setups_count": stats["trade_setups_count"],
+                "pct_strong_trend": float(stats["pct_strong_trend"] or 0)
+            },
+            "top_breakouts": [self._format_breakout(b) for b in row.top_breakouts],
+            "trade_setups": [self._format_trade_setup(t) for t in row.trade_setups]
+        }
 
+    def _format_breakout(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape one top-breakout JSON object for reporting"""
         return {
-            "total_symbols": result.total_symbols,
-            "strong_trend_count": result.strong_trend_count,
-            "breakout_count": result.breakout_count,
-            "macd_cross_count": result.macd_cross_count,
-            "sma_cross_count": result.sma_cross_count,
-            "trade_setups_count": result.trade_setups_count,
-            "pct_strong_trend": float(result.pct_strong_trend or 0)
+            "symbol": row["symbol"],
+            "date": row["date"],
+            "trend_score_d": row["trend_score_d"],
+            "sma20_cross_50_up": row["sma20_cross_50_up"],
+            "price_above_200": row["price_above_200"],
+            "macd_cross_up": row["macd_cross_up"],
+            "donch20_breakout": row["donch20_breakout"],
+            "high_tight_zone": row["high_tight_zone"],
+            "proposed_entry": float(row["proposed_entry"]) if row["proposed_entry"] else None,
+            "proposed_stop": float(row["proposed_stop"]) if row["proposed_stop"] else None,
+            "target1": float(row["target1"]) if row["target1"] else None,
+            "target2": float(row["target2"]) if row["target2"] else None,
+            "risk_reward_ratio": float(row["risk_reward_ratio"]) if row["risk_reward_ratio"] else None,
+            "notes": row["notes"]
         }
 
+    def _format_trade_setup(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape one trade-setup JSON object for reporting"""
+        return {
+            "symbol": row["symbol"],
+            "date": row["date"],
+            "trend_score_d": row["trend_score_d"],
+            "donch20_breakout": row["donch20_breakout"],
+            "entry": float(row["proposed_entry"]),
+            "stop": float(row["proposed_stop"]),
+            "target1": float(row["target1"]),
+            "target2": float(row["target2"]) if row["target2"] else None,
+            "r_r_ratio": float(row["risk_reward_ratio"]) if row["risk_reward_ratio"] else None,
+            "notes": row["notes"]
+        }
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get statistics after signal computation"""
+        return self.get_report()["stats"]
+
     def get_top_breakouts(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get top daily breakouts by trend score"""
-        query = text("""
-            SELECT
-                symbol,
-                date,
-                trend_score_d,
-                sma20_cross_50_up,
-                price_above_200,
-                macd_cross_up,
-                donch20_breakout,
-                high_tight_zone,
-                proposed_entry,
-                proposed_stop,
-                target1,
-                target2,
-                risk_reward_ratio,
-                notes
-            FROM signals_daily_latest
-            WHERE trend_score_d >= 30  -- Minimum threshold for display
-            ORDER BY trend_score_d DESC, donch20_breakout DESC, symbol
-            LIMIT :limit
-        """)
-
-        with self.Session() as session:
-            result = session.execute(query, {"limit": limit})
-            rows = result.fetchall()
-
-        breakouts = []
-        for row in rows:
-            breakouts.append({
-                "symbol": row.symbol,
-                "date": row.date.strftime('%Y-%m-%d'),
-                "trend_score_d": row.trend_score_d,
-                "sma20_cross_50_up": row.sma20_cross_50_up,
-                "price_above_200": row.price_above_200,
-                "macd_cross_up": row.macd_cross_up,
-                "donch20_breakout": row.donch20_breakout,
-                "high_tight_zone": row.high_tight_zone,
-                "proposed_entry": float(row.proposed_entry) if row.proposed_entry else None,
-                "proposed_stop": float(row.proposed_stop) if row.proposed_stop else None,
-                "target1": float(row.target1) if row.target1 else None,
-                "target2": float(row.target2) if row.target2 else None,
-                "risk_reward_ratio": float(row.risk_reward_ratio) if row.risk_reward_ratio else None,
-                "notes": row.notes
-            })
-
-        return breakouts
+        return self.get_report(limit=limit)["top_breakouts"]
 
     def get_active_trade_setups(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get active trade setups with entry/stop/targets"""
-        query = text("""
-            SELECT
-                symbol,
-                date,
-                trend_score_d,
-                donch20_breakout,
-                proposed_entry,
-                proposed_stop,
-                target1,
-                target2,
-                risk_reward_ratio,
-                notes
-            FROM signals_daily_latest
-            WHERE proposed_entry IS NOT NULL
-            ORDER BY trend_score_d DESC, risk_reward_ratio DESC NULLS LAST
-            LIMIT :limit
-        """)
+        return self.get_report(limit=limit)["trade_setups"]
 
-        with self.Session() as session:
-            result = session.execute(query, {"limit": limit})
-            rows = result.fetchall()
-
-        setups = []
-        for row in rows:
-            setups.append({
-                "symbol": row.symbol,
-                "date": row.date.strftime('%Y-%m-%d'),
-                "trend_score_d": row.trend_score_d,
-                "donch20_breakout": row.donch20_breakout,
-                "entry": float(row.proposed_entry),
-                "stop": float(row.proposed_stop),
-                "target1": float(row.target1),
-                "target2": float(row.target2) if row.target2 else None,
-                "r_r_ratio": float(row.risk_reward_ratio) if row.risk_reward_ratio else None,
-                "notes": row.notes
-            })
-
-        return setups
-
-    def run(self, dry_run: bool = False) -> Dict[str, Any]:
+    def run(self, dry_run: bool = False, full_refresh: bool = False) -> Dict[str, Any]:
         """Execute the daily signals job"""
         logger.info("="*60)
         logger.info("DAILY SIGNALS JOB - START")
@@ -201,7 +247,7 @@ class DailySignalsJob:
         start_time = datetime.now()
 
         # Step 1: Execute signals computation
-        result = self.execute_signals_computation(dry_run=dry_run)
+        result = self.execute_signals_computation(dry_run=dry_run, full_refresh=full_refresh)
 
         if not result["success"]:
             logger.error("Daily signals computation failed")
@@ -211,14 +257,11 @@ class DailySignalsJob:
             logger.info("[DRY RUN] Skipping statistics and reporting")
             return result
 
-        # Step 2: Get statistics
-        stats = self.get_statistics()
-
-        # Step 3: Get top breakouts
-        top_breakouts = self.get_top_breakouts(limit=10)
-
-        # Step 4: Get active trade setups
-        trade_setups = self.get_active_trade_setups(limit=10)
+        # Steps 2-4: Statistics, top breakouts and active trade setups in one query
+        report = self.get_report(limit=10)
+        stats = report["stats"]
+        top_breakouts = report["top_breakouts"]
+        trade_setups = report["trade_setups"]
 
         elapsed = (datetime.now() - start_time).total_seconds()
 
@@ -292,6 +335,8 @@ def main():
 
     parser = argparse.ArgumentParser(description='Daily Signals Job')
     parser.add_argument('--dry-run', action='store_true', help='Dry run mode (no database writes)')
+    parser.add_argument('--full-refresh', action='store_true',
+                        help='Rebuild signals_daily_latest from the full signal history')
     args = parser.parse_args()
 
     # Get DB DSN from environment
@@ -302,7 +347,7 @@ def main():
 
     try:
         job = DailySignalsJob(db_dsn)
-        result = job.run(dry_run=args.dry_run)
+        result = job.run(dry_run=args.dry_run, full_refresh=args.full_refresh)
 
         if not result['success']:
             sys.exit(1)
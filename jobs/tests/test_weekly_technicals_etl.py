@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from weekly_technicals_etl import (
+    _adx_njit, _atr_njit, _macd_njit, _panel_indicators_njit, _rsi_njit
+)
+
+# Expected values were produced by pandas_ta 0.4.71b0 (rsi, adx, atr and macd
+# with their default settings) on the series below, which the kernels port
+POSITIONS = [14, 20, 33, 47, 59]
+
+
+def weekly_series(n=60):
+    i = np.arange(n, dtype=np.float64)
+    close = 100 + 10 * np.sin(i / 5) + 0.3 * i
+    high = close + 1 + 0.5 * np.abs(np.cos(i / 3))
+    low = close - 1 - 0.5 * np.abs(np.sin(i / 4))
+    return high, low, close
+
+
+def assert_matches(values, first_valid, expected):
+    assert np.isnan(values[:first_valid]).all()
+    assert not np.isnan(values[first_valid])
+    np.testing.assert_allclose(values[POSITIONS], expected, rtol=1e-9, equal_nan=True)
+
+
+class TestIndicatorKernels:
+    def test_rsi_matches_pandas_ta(self):
+        _, _, close = weekly_series()
+        assert_matches(_rsi_njit(close, 14), 1, [
+            79.51135632974733, 51.5051319151486, 78.7163540885802,
+            54.995315778801924, 51.93754183873697,
+        ])
+
+    def test_adx_matches_pandas_ta(self):
+        high, low, close = weekly_series()
+        assert_matches(_adx_njit(high, low, close, 14), 13, [
+            72.24764689412287, 53.500524734765605, 37.99997872061118,
+            46.00010414044944, 28.81087027853427,
+        ])
+
+    def test_atr_matches_pandas_ta(self):
+        high, low, close = weekly_series()
+        assert_matches(_atr_njit(high, low, close, 14), 13, [
+            2.858319544162391, 2.915641079408304, 2.9906213268573056,
+            2.8816015688763725, 2.813167866496591,
+        ])
+
+    def test_macd_matches_pandas_ta(self):
+        _, _, close = weekly_series()
+        macd, signal, hist = _macd_njit(close, 12, 26, 9)
+        assert_matches(macd, 25, [
+            np.nan, np.nan, -0.16306354780344634,
+            2.7946959807761544, -1.1491258002188687,
+        ])
+        assert_matches(signal, 33, [
+            np.nan, np.nan, -2.800520464607724,
+            3.2115479559357403, -0.6309636012503513,
+        ])
+        assert_matches(hist, 33, [
+            np.nan, np.nan, 2.6374569168042776,
+            -0.41685197515958583, -0.5181621989685173,
+        ])
+
+
+class TestPanelIndicators:
+    def test_symbols_are_computed_independently(self):
+        high, low, close = weekly_series()
+        short_high, short_low, short_close = (a[:45] for a in weekly_series(45))
+        bounds = np.array([0, 60, 105])
+
+        panel = _panel_indicators_njit(
+            np.concatenate([high, short_high]),
+            np.concatenate([low, short_low]),
+            np.concatenate([close, short_close]),
+            bounds,
+        )
+
+        single = (
+            _rsi_njit(short_close, 14),
+            _adx_njit(short_high, short_low, short_close, 14),
+            _atr_njit(short_high, short_low, short_close, 14),
+            *_macd_njit(short_close, 12, 26, 9),
+        )
+        for panel_values, expected in zip(panel, single):
+            np.testing.assert_allclose(panel_values[60:], expected, rtol=1e-12, equal_nan=True)
+
+    def test_flat_prices_do_not_divide_by_zero(self):
+        flat = np.full(40, 50.0)
+        rsi, adx, atr, *_ = _panel_indicators_njit(flat, flat, flat, np.array([0, 40]))
+        assert np.isfinite(atr[13:]).all()
+        assert not np.isinf(rsi).any()
+        assert not np.isinf(adx).any()
@@ -0,0 +1,24 @@
+-- Migration 004: Top-N indexes for the daily signals report queries
+-- Run: psql $DB_DSN -f migrations/004_signals_report_indexes.sql
+--
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so this
+-- migration has no BEGIN/COMMIT; each statement commits on its own and the
+-- table stays writable while the indexes build.
+
+-- ============================================================================
+-- Indexes on signals_daily_latest for the daily signals report
+-- ============================================================================
+
+-- Top breakouts: WHERE trend_score_d >= 30
+-- ORDER BY trend_score_d DESC, donch20_breakout DESC, symbol LIMIT n
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_signals_top_breakouts
+    ON signals_daily_latest(trend_score_d DESC, donch20_breakout DESC, symbol)
+    WHERE trend_score_d >= 30;
+
+-- Active trade setups: WHERE proposed_entry IS NOT NULL
+-- ORDER BY trend_score_d DESC, risk_reward_ratio DESC NULLS LAST LIMIT n
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_signals_active_setups
+    ON signals_daily_latest(trend_score_d DESC, risk_reward_ratio DESC NULLS LAST)
+    WHERE proposed_entry IS NOT NULL;
+
+ANALYZE signals_daily_latest;
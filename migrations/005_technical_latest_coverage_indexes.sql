@@ -0,0 +1,24 @@
+-- Migration 005: Partial indexes so technical_latest coverage counts use index-only scans
+-- Run: psql $DB_DSN -f migrations/005_technical_latest_coverage_indexes.sql
+-- (CONCURRENTLY, without BEGIN/COMMIT; see migration 004)
+
+-- ============================================================================
+-- Indexes on technical_latest for populated-indicator counts
+-- ============================================================================
+
+-- SELECT COUNT(*) FROM technical_latest WHERE sma20 IS NOT NULL
+CREATE INDEX CONCURRENTLY IF NOT EXISTS technical_latest_sma20_nn_idx
+    ON technical_latest(symbol)
+    WHERE sma20 IS NOT NULL;
+
+-- SELECT COUNT(*) FROM technical_latest WHERE sma50 IS NOT NULL
+CREATE INDEX CONCURRENTLY IF NOT EXISTS technical_latest_sma50_nn_idx
+    ON technical_latest(symbol)
+    WHERE sma50 IS NOT NULL;
+
+-- SELECT COUNT(*) FROM technical_latest WHERE rsi14 IS NOT NULL
+CREATE INDEX CONCURRENTLY IF NOT EXISTS technical_latest_rsi14_nn_idx
+    ON technical_latest(symbol)
+    WHERE rsi14 IS NOT NULL;
+
+ANALYZE technical_latest;
@@ -0,0 +1,19 @@
+-- Migration 006: (tech_job_id, created_at DESC) index for the latest successes of a tech job
+-- Run: psql $DB_DSN -f migrations/006_tech_job_successes_index.sql
+-- (CONCURRENTLY, without BEGIN/COMMIT; see migration 004)
+
+-- ============================================================================
+-- Indexes on tech_job_successes
+-- ============================================================================
+
+-- Latest successes for a job: WHERE tech_job_id = :id
+-- ORDER BY created_at DESC LIMIT n
+CREATE INDEX CONCURRENTLY IF NOT EXISTS tech_job_successes_job_created_idx
+    ON tech_job_successes(tech_job_id, created_at DESC);
+
+-- The composite index has tech_job_id as its leading column, so it also
+-- serves the per-job counts the single-column index was there for. Dropped
+-- CONCURRENTLY so no ACCESS EXCLUSIVE lock is taken on the table
+DROP INDEX CONCURRENTLY IF EXISTS tech_job_successes_job_id_idx;
+
+ANALYZE tech_job_successes;
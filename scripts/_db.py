@@ -0,0 +1,27 @@
+"""Shared psycopg2 connection and report output for the check scripts in this directory.
+
+The scripts add scripts/ to sys.path themselves, so they can be run from
+any working directory, e.g. python scripts/test_aapl_tech.py.
+"""
+
+import atexit
+import sys
+from functools import lru_cache
+
+import psycopg2
+
+from _env import db_kwargs
+
+
+@lru_cache(maxsize=None)
+def get_connection():
+    """Open the database connection on first call and reuse it afterwards"""
+    conn = psycopg2.connect(**db_kwargs())
+    atexit.register(conn.close)
+    return conn
+
+
+def flush_report(lines):
+    """Write the buffered report lines to stdout in a single call"""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
@@ -0,0 +1,19 @@
+"""Database settings for the check scripts in this directory.
+
+The scripts run from a workstation, so they default to the local database.
+DATABASE_* environment variables override individual settings. backend/.env
+is deliberately not read, because it points at the docker network host.
+"""
+
+import os
+
+
+def db_kwargs():
+    """Return psycopg2.connect keyword arguments: localhost defaults, env overrides"""
+    return {
+        'host': os.getenv('DATABASE_HOST', 'localhost'),
+        'port': os.getenv('DATABASE_PORT', '5432'),
+        'database': os.getenv('DATABASE_NAME', 'stockwatchlist'),
+        'user': os.getenv('DATABASE_USER', 'stockuser'),
+        'password': os.getenv('DATABASE_PASSWORD', 'stockpass'),
+    }
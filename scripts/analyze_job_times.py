@@ -2,7 +2,9 @@
 """Analyze job execution times and validate scheduled runs"""
 
 from datetime import datetime
-import pytz
+from zoneinfo import ZoneInfo
+
+CST = ZoneInfo('America/Chicago')
 
 def convert_utc_to_cst(utc_time_str):
     """Convert UTC timestamp to CST"""
@@ -10,10 +12,7 @@ def convert_utc_to_cst(utc_time_str):
     utc_time = datetime.fromisoformat(utc_time_str.replace('Z', '+00:00'))
 
     # Convert to CST
-    cst = pytz.timezone('America/Chicago')
-    cst_time = utc_time.astimezone(cst)
-
-    return cst_time
+    return utc_time.astimezone(CST)
 
 def analyze_jobs():
     print("=== Job Scheduling Analysis ===\n")
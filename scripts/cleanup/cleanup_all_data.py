@@ -15,23 +15,12 @@ def cleanup_all_data():
     
     try:
         with engine.connect() as conn:
-            # Clean up import-related tables
-            print("Deleting import errors...")
-            result = conn.execute(text("DELETE FROM import_errors"))
-            print(f"Deleted {result.rowcount} import errors")
-            
-            print("Deleting processed files...")
-            result = conn.execute(text("DELETE FROM processed_files"))
-            print(f"Deleted {result.rowcount} processed files")
-            
-            print("Deleting import jobs...")
-            result = conn.execute(text("DELETE FROM import_jobs"))
-            print(f"Deleted {result.rowcount} import jobs")
-            
-            # Clean up historical prices
-            print("Deleting historical prices...")
-            result = conn.execute(text("DELETE FROM historical_prices"))
-            print(f"Deleted {result.rowcount} historical price records")
+            # One TRUNCATE empties the import tables and historical prices
+            # together, without scanning and WAL-logging every row
+            print("Truncating import errors, processed files, import jobs and historical prices...")
+            conn.execute(text(
+                "TRUNCATE TABLE import_errors, processed_files, import_jobs, historical_prices"
+            ))
             
             # Commit the transaction
             conn.commit()
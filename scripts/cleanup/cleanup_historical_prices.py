@@ -25,9 +25,8 @@ def cleanup_historical_prices():
         
         with engine.connect() as conn:
             # Clean up historical prices
-            logger.info("Deleting all historical prices...")
-            result = conn.execute(text("DELETE FROM historical_prices"))
-            logger.info(f"Deleted {result.rowcount} historical price records")
+            logger.info("Truncating historical prices...")
+            conn.execute(text("TRUNCATE TABLE historical_prices"))
             
             # Commit the transaction
             conn.commit()
@@ -19,30 +19,23 @@ def cleanup_stuck_imports():
         
         print("Connected to PostgreSQL database")
         
-        # Find stuck import jobs (running for more than 1 hour)
+        # Mark stuck import jobs (running for more than 1 hour) as failed
+        # and get them back in the same statement
         cursor.execute("""
-            SELECT id, status, folder_path, started_at 
-            FROM import_jobs 
+            UPDATE import_jobs 
+            SET status = 'failed', completed_at = NOW()
             WHERE status = 'running' 
             AND started_at < NOW() - INTERVAL '1 hour'
-            ORDER BY started_at DESC;
+            RETURNING id, folder_path, started_at;
         """)
         
-        stuck_jobs = cursor.fetchall()
+        stuck_jobs = sorted(cursor.fetchall(), key=lambda job: job[2], reverse=True)
         print(f"Found {len(stuck_jobs)} stuck import jobs:")
         
-        for job in stuck_jobs:
-            print(f"  Job #{job[0]}: {job[1]} - {job[2]} - Started: {job[3]}")
+        for job_id, folder_path, started_at in stuck_jobs:
+            print(f"  Job #{job_id}: running - {folder_path} - Started: {started_at}")
         
         if stuck_jobs:
-            # Mark stuck jobs as failed
-            stuck_job_ids = [job[0] for job in stuck_jobs]
-            cursor.execute("""
-                UPDATE import_jobs 
-                SET status = 'failed', completed_at = NOW()
-                WHERE id = ANY(%s);
-            """, (stuck_job_ids,))
-            
             print(f"Marked {len(stuck_jobs)} stuck jobs as failed")
         
         # Show current import job status
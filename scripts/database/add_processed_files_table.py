@@ -3,6 +3,8 @@
 Script to add processed_files table for import resume functionality
 """
 
+from contextlib import closing
+
 import psycopg2
 from psycopg2 import sql
 from backend.common.database import get_database_url
@@ -14,78 +16,85 @@ def add_processed_files_table():
     """Create processed_files table for tracking import progress"""
     try:
         # Connect to PostgreSQL
-        conn = psycopg2.connect(DATABASE_URL)
-        cursor = conn.cursor()
-        
-        print("Connected to PostgreSQL database")
-        
-        # Check if table already exists
-        cursor.execute("""
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables 
-                WHERE table_name = 'processed_files'
-            );
-        """)
-        
-        table_exists = cursor.fetchone()[0]
-        
-        if table_exists:
-            print("processed_files table already exists")
-        else:
-            print("Creating processed_files table...")
-            
-            # Create the table
-            create_table_sql = """
-            CREATE TABLE processed_files (
-                id SERIAL PRIMARY KEY,
-                import_job_id INTEGER NOT NULL,
-                file_path VARCHAR NOT NULL,
-                file_size BIGINT NOT NULL,
-                file_modified_time TIMESTAMP NOT NULL,
-                rows_processed INTEGER NOT NULL DEFAULT 0,
-                rows_inserted INTEGER NOT NULL DEFAULT 0,
-                rows_updated INTEGER NOT NULL DEFAULT 0,
-                processing_start TIMESTAMP NOT NULL DEFAULT NOW(),
-                processing_end TIMESTAMP,
-                checksum VARCHAR,
-                status VARCHAR NOT NULL DEFAULT 'processing'
-            );
-            """
-            
-            cursor.execute(create_table_sql)
-            
+        with closing(psycopg2.connect(DATABASE_URL)) as conn, conn.cursor() as cursor:
+            print("Connected to PostgreSQL database")
+
+            # idempotent; skip the WAL fsync wait
+            cursor.execute("SET synchronous_commit = OFF;")
+
+            # IF NOT EXISTS makes the create idempotent without a separate
+            # information_schema lookup
+            print("Creating processed_files table if missing...")
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS processed_files (
+                    id SERIAL PRIMARY KEY,
+                    import_job_id INTEGER NOT NULL,
+                    file_path VARCHAR NOT NULL,
+                    file_size BIGINT NOT NULL,
+                    file_modified_time TIMESTAMP NOT NULL,
+                    rows_processed INTEGER NOT NULL DEFAULT 0,
+                    rows_inserted INTEGER NOT NULL DEFAULT 0,
+                    rows_updated INTEGER NOT NULL DEFAULT 0,
+                    processing_start TIMESTAMP NOT NULL DEFAULT NOW(),
+                    processing_end TIMESTAMP,
+                    checksum VARCHAR,
+                    status VARCHAR NOT NULL DEFAULT 'processing'
+                );
+            """)
+            print("processed_files table is in place")
+
+            # Commit the changes
+            conn.commit()
+
+            # CONCURRENTLY builds take a SHARE UPDATE EXCLUSIVE lock, so a running
+            # import keeps writing; they cannot run inside a transaction block
+            conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+
+            # A failed CONCURRENTLY build leaves an INVALID index behind, which
+            # IF NOT EXISTS would skip; drop those so they are rebuilt below
+            cursor.execute("""
+                SELECT c.relname
+                FROM pg_index i
+                JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE i.indrelid = 'processed_files'::regclass
+                AND NOT i.indisvalid;
+            """)
+            for (index_name,) in cursor.fetchall():
+                print(f"Dropping invalid index {index_name}...")
+                cursor.execute(
+                    sql.SQL("DROP INDEX CONCURRENTLY IF EXISTS {};").format(sql.Identifier(index_name))
+                )
+
             # Create indexes for performance
             indexes = [
-                "CREATE INDEX processed_files_job_idx ON processed_files(import_job_id);",
-                "CREATE INDEX processed_files_path_idx ON processed_files(file_path);",
-                "CREATE INDEX processed_files_status_idx ON processed_files(status);",
-                "CREATE UNIQUE INDEX processed_files_job_path_idx ON processed_files(import_job_id, file_path);"
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS processed_files_job_idx ON processed_files(import_job_id);",
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS processed_files_path_idx ON processed_files(file_path);",
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS processed_files_status_idx ON processed_files(status);",
+                "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS processed_files_job_path_idx ON processed_files(import_job_id, file_path);",
+                # Resume scans ask which files of a job are not done yet; most rows
+                # are completed, so the partial index stays small
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS processed_files_job_pending_idx ON processed_files(import_job_id, file_path) WHERE status <> 'completed';"
             ]
-            
+
             for index_sql in indexes:
                 print(f"Creating index...")
                 cursor.execute(index_sql)
-            
-            print("processed_files table created successfully")
-        
-        # Commit the changes
-        conn.commit()
-        
-        # Verify the table structure
-        cursor.execute("""
-            SELECT column_name, data_type, is_nullable 
-            FROM information_schema.columns 
-            WHERE table_name = 'processed_files' 
-            ORDER BY ordinal_position;
-        """)
-        
-        columns = cursor.fetchall()
-        print(f"Table structure verified. Columns: {len(columns)}")
-        for col in columns:
-            print(f"  - {col[0]} ({col[1]}) {'NULL' if col[2] == 'YES' else 'NOT NULL'}")
-        
-        return True
-        
+
+            # Verify the table structure
+            cursor.execute("""
+                SELECT column_name, data_type, is_nullable 
+                FROM information_schema.columns 
+                WHERE table_name = 'processed_files' 
+                ORDER BY ordinal_position;
+            """)
+
+            columns = cursor.fetchall()
+            print(f"Table structure verified. Columns: {len(columns)}")
+            for col in columns:
+                print(f"  - {col[0]} ({col[1]}) {'NULL' if col[2] == 'YES' else 'NOT NULL'}")
+
+            return True
+
     except psycopg2.Error as e:
         print(f"PostgreSQL error: {e}")
         return False
@@ -93,10 +102,6 @@ def add_processed_files_table():
         print(f"Error: {e}")
         return False
     finally:
-        if 'cursor' in locals():
-            cursor.close()
-        if 'conn' in locals():
-            conn.close()
         print("Database connection closed")
 
 if __name__ == "__main__":
@@ -3,6 +3,8 @@
 Script to add current_file and current_folder columns to ImportJob table
 """
 
+from contextlib import closing
+
 import psycopg2
 from psycopg2 import sql
 from backend.common.database import get_database_url
@@ -14,55 +16,38 @@ def add_progress_columns():
     """Add current_file and current_folder columns to import_jobs table"""
     try:
         # Connect to PostgreSQL
-        conn = psycopg2.connect(DATABASE_URL)
-        cursor = conn.cursor()
-        
-        print("Connected to PostgreSQL database")
-        
-        # Check if columns already exist
-        cursor.execute("""
-            SELECT column_name 
-            FROM information_schema.columns 
-            WHERE table_name = 'import_jobs' 
-            AND column_name IN ('current_file', 'current_folder')
-            ORDER BY column_name;
-        """)
-        
-        existing_columns = [row[0] for row in cursor.fetchall()]
-        print(f"Existing columns: {existing_columns}")
-        
-        # Add current_file column if it doesn't exist
-        if 'current_file' not in existing_columns:
-            print("Adding current_file column...")
-            cursor.execute("ALTER TABLE import_jobs ADD COLUMN current_file VARCHAR;")
-        else:
-            print("current_file column already exists")
-        
-        # Add current_folder column if it doesn't exist
-        if 'current_folder' not in existing_columns:
-            print("Adding current_folder column...")
-            cursor.execute("ALTER TABLE import_jobs ADD COLUMN current_folder VARCHAR;")
-        else:
-            print("current_folder column already exists")
-        
-        # Commit the changes
-        conn.commit()
-        print("Successfully added progress tracking columns")
-        
-        # Verify the changes
-        cursor.execute("""
-            SELECT column_name 
-            FROM information_schema.columns 
-            WHERE table_name = 'import_jobs' 
-            AND column_name IN ('current_file', 'current_folder')
-            ORDER BY column_name;
-        """)
-        
-        updated_columns = [row[0] for row in cursor.fetchall()]
-        print(f"Updated columns: {updated_columns}")
-        
-        return True
-        
+        with closing(psycopg2.connect(DATABASE_URL)) as conn, conn.cursor() as cursor:
+            print("Connected to PostgreSQL database")
+
+            # idempotent; skip the WAL fsync wait
+            cursor.execute("SET synchronous_commit = OFF;")
+
+            # Add both columns in one idempotent ALTER (one lock, one catalog update)
+            print("Adding current_file and current_folder columns if missing...")
+            cursor.execute("""
+                ALTER TABLE import_jobs
+                    ADD COLUMN IF NOT EXISTS current_file VARCHAR,
+                    ADD COLUMN IF NOT EXISTS current_folder VARCHAR;
+            """)
+
+            # Commit the changes
+            conn.commit()
+            print("Successfully added progress tracking columns")
+
+            # Verify the changes
+            cursor.execute("""
+                SELECT column_name 
+                FROM information_schema.columns 
+                WHERE table_name = 'import_jobs' 
+                AND column_name IN ('current_file', 'current_folder')
+                ORDER BY column_name;
+            """)
+
+            updated_columns = [row[0] for row in cursor.fetchall()]
+            print(f"Updated columns: {updated_columns}")
+
+            return True
+
     except psycopg2.Error as e:
         print(f"PostgreSQL error: {e}")
         return False
@@ -70,10 +55,6 @@ def add_progress_columns():
         print(f"Error: {e}")
         return False
     finally:
-        if 'cursor' in locals():
-            cursor.close()
-        if 'conn' in locals():
-            conn.close()
         print("Database connection closed")
 
 if __name__ == "__main__":
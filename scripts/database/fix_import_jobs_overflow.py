@@ -3,6 +3,8 @@
 Script to fix integer overflow in import_jobs table by changing row count columns to BIGINT
 """
 
+from contextlib import closing
+
 import psycopg2
 from psycopg2 import sql
 from backend.common.database import get_database_url
@@ -14,54 +16,62 @@ def fix_import_jobs_overflow():
     """Change row count columns in import_jobs table from integer to bigint"""
     try:
         # Connect to PostgreSQL
-        conn = psycopg2.connect(DATABASE_URL)
-        cursor = conn.cursor()
-        
-        print("Connected to PostgreSQL database")
-        
-        # Check current column types
-        cursor.execute("""
-            SELECT column_name, data_type 
-            FROM information_schema.columns 
-            WHERE table_name = 'import_jobs' 
-            AND column_name IN ('total_files', 'processed_files', 'total_rows', 'inserted_rows', 'error_count')
-            ORDER BY column_name;
-        """)
-        
-        current_types = cursor.fetchall()
-        print(f"Current column types: {current_types}")
-        
-        # Alter columns to BIGINT to handle large row counts
-        columns_to_alter = [
-            'total_files',
-            'processed_files', 
-            'total_rows',
-            'inserted_rows',
-            'error_count'
-        ]
-        
-        for column in columns_to_alter:
-            print(f"Altering {column} column to BIGINT...")
-            cursor.execute(f"ALTER TABLE import_jobs ALTER COLUMN {column} TYPE BIGINT;")
-        
-        # Commit the changes
-        conn.commit()
-        print("Successfully altered all row count columns to BIGINT")
-        
-        # Verify the changes
-        cursor.execute("""
-            SELECT column_name, data_type 
-            FROM information_schema.columns 
-            WHERE table_name = 'import_jobs' 
-            AND column_name IN ('total_files', 'processed_files', 'total_rows', 'inserted_rows', 'error_count')
-            ORDER BY column_name;
-        """)
-        
-        updated_types = cursor.fetchall()
-        print(f"Updated column types: {updated_types}")
-        
-        return True
-        
+        with closing(psycopg2.connect(DATABASE_URL)) as conn, conn.cursor() as cursor:
+            print("Connected to PostgreSQL database")
+
+            # idempotent; skip the WAL fsync wait
+            cursor.execute("SET synchronous_commit = OFF;")
+
+            # Check current column types
+            cursor.execute("""
+                SELECT column_name, data_type 
+                FROM information_schema.columns 
+                WHERE table_name = 'import_jobs' 
+                AND column_name IN ('total_files', 'processed_files', 'total_rows', 'inserted_rows', 'error_count')
+                ORDER BY column_name;
+            """)
+
+            current_types = cursor.fetchall()
+            print(f"Current column types: {current_types}")
+
+            # Alter columns to BIGINT to handle large row counts
+            columns_to_alter = [
+                'total_files',
+                'processed_files', 
+                'total_rows',
+                'inserted_rows',
+                'error_count'
+            ]
+
+            # One ALTER TABLE rewrites the heap once for all five columns
+            print(f"Altering {', '.join(columns_to_alter)} columns to BIGINT...")
+            cursor.execute(
+                sql.SQL("ALTER TABLE import_jobs {alters};").format(
+                    alters=sql.SQL(", ").join(
+                        sql.SQL("ALTER COLUMN {} TYPE BIGINT").format(sql.Identifier(column))
+                        for column in columns_to_alter
+                    )
+                )
+            )
+
+            # Commit the changes
+            conn.commit()
+            print("Successfully altered all row count columns to BIGINT")
+
+            # Verify the changes
+            cursor.execute("""
+                SELECT column_name, data_type 
+                FROM information_schema.columns 
+                WHERE table_name = 'import_jobs' 
+                AND column_name IN ('total_files', 'processed_files', 'total_rows', 'inserted_rows', 'error_count')
+                ORDER BY column_name;
+            """)
+
+            updated_types = cursor.fetchall()
+            print(f"Updated column types: {updated_types}")
+
+            return True
+
     except psycopg2.Error as e:
         print(f"PostgreSQL error: {e}")
         return False
@@ -69,10 +79,6 @@ def fix_import_jobs_overflow():
         print(f"Error: {e}")
         return False
     finally:
-        if 'cursor' in locals():
-            cursor.close()
-        if 'conn' in locals():
-            conn.close()
         print("Database connection closed")
 
 if __name__ == "__main__":
@@ -1,72 +1,68 @@
 #!/usr/bin/env python3
 """Test script to check AAPL technical indicators"""
 
-import psycopg2
 import sys
+from pathlib import Path
+
+# The shared helpers live next to this script; make them importable however
+# the script is started (python scripts/<name>.py, an IDE, a test harness)
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from _db import flush_report, get_connection
 
 def test_aapl_tech():
+    # Collect the report and write it in one call at the end
+    out = []
     try:
-        # Connect to the database
-        conn = psycopg2.connect(
-            host="localhost",
-            port="5432",
-            database="stockwatchlist",
-            user="stockuser",
-            password="stockpass"
-        )
-
+        conn = get_connection()
         cursor = conn.cursor()
 
-        # Test technical_latest table for AAPL
+        # Fetch AAPL, MSFT and NFLX in a single round-trip
         cursor.execute("""
             SELECT symbol, date, close, volume, sma20, sma50, sma200, rsi14, adx14
             FROM technical_latest
-            WHERE symbol = 'AAPL'
-            LIMIT 1
-        """)
+            WHERE symbol = ANY(%s)
+        """, (['AAPL', 'MSFT', 'NFLX'],))
 
-        result = cursor.fetchone()
+        rows = {row[0]: row for row in cursor.fetchall()}
+
+        result = rows.get('AAPL')
         if result:
             symbol, date, close, volume, sma20, sma50, sma200, rsi14, adx14 = result
-            print(f"AAPL Technical Data (latest):")
-            print(f"  Symbol: {symbol}")
-            print(f"  Date: {date}")
-            print(f"  Close: {close}")
-            print(f"  Volume: {volume}")
-            print(f"  SMA20: {sma20}")
-            print(f"  SMA50: {sma50}")
-            print(f"  SMA200: {sma200}")
-            print(f"  RSI14: {rsi14}")
-            print(f"  ADX14: {adx14}")
+            out.append(f"AAPL Technical Data (latest):")
+            out.append(f"  Symbol: {symbol}")
+            out.append(f"  Date: {date}")
+            out.append(f"  Close: {close}")
+            out.append(f"  Volume: {volume}")
+            out.append(f"  SMA20: {sma20}")
+            out.append(f"  SMA50: {sma50}")
+            out.append(f"  SMA200: {sma200}")
+            out.append(f"  RSI14: {rsi14}")
+            out.append(f"  ADX14: {adx14}")
 
             # Check if indicators are populated
             if sma20 is not None and sma50 is not None:
-                print("\nSUCCESS: Technical indicators are populated!")
+                out.append("\nSUCCESS: Technical indicators are populated!")
             else:
-                print("\nFAILED: Technical indicators are still null")
+                out.append("\nFAILED: Technical indicators are still null")
         else:
-            print("No data found for AAPL in technical_latest")
+            out.append("No data found for AAPL in technical_latest")
 
         # Also check MSFT and NFLX
         for symbol in ['MSFT', 'NFLX']:
-            cursor.execute("""
-                SELECT symbol, date, close, sma20, sma50, sma200, rsi14
-                FROM technical_latest
-                WHERE symbol = %s
-                LIMIT 1
-            """, (symbol,))
-
-            result = cursor.fetchone()
+            result = rows.get(symbol)
             if result:
-                sym, date, close, sma20, sma50, sma200, rsi14 = result
-                print(f"\n{symbol}: close={close}, sma20={sma20}, sma50={sma50}, sma200={sma200}, rsi14={rsi14}")
+                sym, date, close, volume, sma20, sma50, sma200, rsi14, adx14 = result
+                out.append(f"\n{symbol}: close={close}, sma20={sma20}, sma50={sma50}, sma200={sma200}, rsi14={rsi14}")
             else:
-                print(f"\n{symbol}: No data found")
+                out.append(f"\n{symbol}: No data found")
 
         cursor.close()
-        conn.close()
+
+        flush_report(out)
 
     except Exception as e:
+        flush_report(out)
         print(f"Database connection failed: {e}")
         sys.exit(1)
 
@@ -1,74 +1,77 @@
 #!/usr/bin/env python3
 """Test script to verify technical indicators are populated"""
 
-import psycopg2
 import sys
+from pathlib import Path
+
+# The shared helpers live next to this script; make them importable however
+# the script is started (python scripts/<name>.py, an IDE, a test harness)
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from _db import flush_report, get_connection
 
 def test_technical_data():
+    # Collect the report and write it in one call at the end
+    out = []
     try:
-        # Connect to the database
-        conn = psycopg2.connect(
-            host="localhost",
-            port="5432",
-            database="stockwatchlist",
-            user="stockuser",
-            password="stockpass"
-        )
-
+        conn = get_connection()
         cursor = conn.cursor()
 
-        # Test technical_latest table for AAPL
+        # Fetch the AAPL row and the coverage counts in one round-trip; the
+        # LEFT JOIN keeps the statistics row even when AAPL is missing
         cursor.execute("""
-            SELECT symbol, date, close, volume, sma20, sma50, sma200, rsi14, adx14
-            FROM technical_latest
-            WHERE symbol = 'AAPL'
+            SELECT t.symbol, t.date, t.close, t.volume, t.sma20, t.sma50,
+                   t.sma200, t.rsi14, t.adx14,
+                   s.total_symbols, s.symbols_with_sma20,
+                   s.symbols_with_sma50, s.symbols_with_rsi14
+            FROM (
+                -- Separate scalar counts so each can use its partial index
+                SELECT (SELECT COUNT(*) FROM technical_latest) as total_symbols,
+                       (SELECT COUNT(*) FROM technical_latest WHERE sma20 IS NOT NULL) as symbols_with_sma20,
+                       (SELECT COUNT(*) FROM technical_latest WHERE sma50 IS NOT NULL) as symbols_with_sma50,
+                       (SELECT COUNT(*) FROM technical_latest WHERE rsi14 IS NOT NULL) as symbols_with_rsi14
+            ) s
+            LEFT JOIN technical_latest t ON t.symbol = 'AAPL'
             LIMIT 1
         """)
 
-        result = cursor.fetchone()
-        if result:
+        row = cursor.fetchone()
+        result, stats = row[:9], row[9:]
+        if result[0] is not None:
             symbol, date, close, volume, sma20, sma50, sma200, rsi14, adx14 = result
-            print(f"AAPL Technical Data:")
-            print(f"  Symbol: {symbol}")
-            print(f"  Date: {date}")
-            print(f"  Close: {close}")
-            print(f"  Volume: {volume}")
-            print(f"  SMA20: {sma20}")
-            print(f"  SMA50: {sma50}")
-            print(f"  SMA200: {sma200}")
-            print(f"  RSI14: {rsi14}")
-            print(f"  ADX14: {adx14}")
+            out.append(f"AAPL Technical Data:")
+            out.append(f"  Symbol: {symbol}")
+            out.append(f"  Date: {date}")
+            out.append(f"  Close: {close}")
+            out.append(f"  Volume: {volume}")
+            out.append(f"  SMA20: {sma20}")
+            out.append(f"  SMA50: {sma50}")
+            out.append(f"  SMA200: {sma200}")
+            out.append(f"  RSI14: {rsi14}")
+            out.append(f"  ADX14: {adx14}")
 
             # Check if indicators are populated
             if sma20 is not None and sma50 is not None:
-                print("\n✅ SUCCESS: Technical indicators are populated!")
+                out.append("\n✅ SUCCESS: Technical indicators are populated!")
             else:
-                print("\n❌ FAILED: Technical indicators are still null")
+                out.append("\n❌ FAILED: Technical indicators are still null")
         else:
-            print("❌ No data found for AAPL in technical_latest")
+            out.append("❌ No data found for AAPL in technical_latest")
 
         # Check how many symbols have technical data
-        cursor.execute("""
-            SELECT COUNT(*) as total_symbols,
-                   COUNT(sma20) as symbols_with_sma20,
-                   COUNT(sma50) as symbols_with_sma50,
-                   COUNT(rsi14) as symbols_with_rsi14
-            FROM technical_latest
-        """)
-
-        stats = cursor.fetchone()
-        if stats:
-            total, sma20_count, sma50_count, rsi_count = stats
-            print(f"\nTechnical Data Statistics:")
-            print(f"  Total symbols: {total}")
-            print(f"  Symbols with SMA20: {sma20_count}")
-            print(f"  Symbols with SMA50: {sma50_count}")
-            print(f"  Symbols with RSI14: {rsi_count}")
+        total, sma20_count, sma50_count, rsi_count = stats
+        out.append(f"\nTechnical Data Statistics:")
+        out.append(f"  Total symbols: {total}")
+        out.append(f"  Symbols with SMA20: {sma20_count}")
+        out.append(f"  Symbols with SMA50: {sma50_count}")
+        out.append(f"  Symbols with RSI14: {rsi_count}")
 
         cursor.close()
-        conn.close()
+
+        flush_report(out)
 
     except Exception as e:
+        flush_report(out)
         print(f"❌ Database connection failed: {e}")
         sys.exit(1)
 
@@ -0,0 +1,74 @@
+-- ============================================================================
+-- Daily Signals Latest Rebuild
+-- Rebuilds signals_daily_latest from the full signals_daily_hist history.
+-- daily_signals_upsert.sql only refreshes symbols with a signal on the latest
+-- date; run this after backfills or corrections to older history.
+-- ============================================================================
+
+BEGIN;
+
+INSERT INTO signals_daily_latest (
+    symbol,
+    date,
+    sma20_cross_50_up,
+    price_above_200,
+    rsi_cross_50_up,
+    macd_cross_up,
+    donch20_breakout,
+    high_tight_zone,
+    below_200_sma,
+    macd_cross_down,
+    rsi_cross_50_down,
+    trend_score_d,
+    proposed_entry,
+    proposed_stop,
+    target1,
+    target2,
+    risk_reward_ratio,
+    notes,
+    updated_at
+)
+SELECT DISTINCT ON (symbol)
+    symbol,
+    date,
+    sma20_cross_50_up,
+    price_above_200,
+    rsi_cross_50_up,
+    macd_cross_up,
+    donch20_breakout,
+    high_tight_zone,
+    below_200_sma,
+    macd_cross_down,
+    rsi_cross_50_down,
+    trend_score_d,
+    proposed_entry,
+    proposed_stop,
+    target1,
+    target2,
+    risk_reward_ratio,
+    notes,
+    NOW()
+FROM signals_daily_hist
+ORDER BY symbol, date DESC
+ON CONFLICT (symbol)
+DO UPDATE SET
+    date = EXCLUDED.date,
+    sma20_cross_50_up = EXCLUDED.sma20_cross_50_up,
+    price_above_200 = EXCLUDED.price_above_200,
+    rsi_cross_50_up = EXCLUDED.rsi_cross_50_up,
+    macd_cross_up = EXCLUDED.macd_cross_up,
+    below_200_sma = EXCLUDED.below_200_sma,
+    macd_cross_down = EXCLUDED.macd_cross_down,
+    rsi_cross_50_down = EXCLUDED.rsi_cross_50_down,
+    donch20_breakout = EXCLUDED.donch20_breakout,
+    high_tight_zone = EXCLUDED.high_tight_zone,
+    trend_score_d = EXCLUDED.trend_score_d,
+    proposed_entry = EXCLUDED.proposed_entry,
+    proposed_stop = EXCLUDED.proposed_stop,
+    target1 = EXCLUDED.target1,
+    target2 = EXCLUDED.target2,
+    risk_reward_ratio = EXCLUDED.risk_reward_ratio,
+    notes = EXCLUDED.notes,
+    updated_at = NOW();
+
+COMMIT;
@@ -357,6 +357,9 @@ DO UPDATE SET
 
 -- ============================================================================
 -- Step 4: Upsert latest signals per symbol into signals_daily_latest
+-- Only the rows written in Step 3 can change a symbol's latest signal, so the
+-- delta is taken from signals_daily_hist for the latest technical_daily date
+-- (see sql/daily_signals_latest_rebuild.sql for the full rebuild)
 -- ============================================================================
 INSERT INTO signals_daily_latest (
     symbol,
@@ -379,7 +382,7 @@ INSERT INTO signals_daily_latest (
     notes,
     updated_at
 )
-SELECT DISTINCT ON (symbol)
+SELECT
     symbol,
     date,
     sma20_cross_50_up,
@@ -400,7 +403,7 @@ SELECT DISTINCT ON (symbol)
     notes,
     NOW()
 FROM signals_daily_hist
-ORDER BY symbol, date DESC
+WHERE date = (SELECT MAX(date)::date FROM technical_daily)
 ON CONFLICT (symbol)
 DO UPDATE SET
     date = EXCLUDED.date,
@@ -420,7 +423,8 @@ DO UPDATE SET
     target2 = EXCLUDED.target2,
     risk_reward_ratio = EXCLUDED.risk_reward_ratio,
     notes = EXCLUDED.notes,
-    updated_at = NOW();
+    updated_at = NOW()
+WHERE signals_daily_latest.date <= EXCLUDED.date;
 
 COMMIT;
 